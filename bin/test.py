@@ -8,7 +8,7 @@ from sys import stdout
 
 
 def run(cmd: str, *args: str) -> str:
-    return check_output([cmd, *args], encoding="utf8", stderr=stdout, universal_newlines=True).rstrip()
+    return check_output([cmd, *args], encoding="utf8", stderr=stdout).rstrip()
 
 
 ci = environ.get("CI") == "true"
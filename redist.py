@@ -1,28 +1,36 @@
 #!/usr/bin/env python3
+import json
 import os
 import platform
 import re
 import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
 from copy import deepcopy
 from dataclasses import dataclass, field
-from email.message import EmailMessage
-from http.client import OK
+from functools import cache
+from hashlib import sha256
+from http.client import NOT_MODIFIED, OK
+from mmap import ACCESS_READ, mmap
 from pathlib import Path
 from subprocess import DEVNULL, STDOUT, check_call, check_output
-from tempfile import mkdtemp
+from subprocess import run as spawn
+from tempfile import mkdtemp, mkstemp
 from time import gmtime, strftime
-from typing import Any, Final, Literal, NoReturn, TypeAlias, final, TypedDict, Iterable
+from typing import TYPE_CHECKING, Any, Final, Literal, NoReturn, TypeAlias, final, TypedDict, Iterable
 from zipfile import ZIP_DEFLATED, ZipInfo
 
 import click
 from click_help_colors import HelpColorsGroup
 from dataclasses_json import DataClassJsonMixin, undefined
 from packaging.version import Version
-from requests import Session
 from rich import markup, traceback
 from rich.console import Console
 from wheel.wheelfile import WheelFile
 
+if TYPE_CHECKING:
+    from httpx import Client
+    from rich.status import Status
+
 # region ----------------------------------------------------------------------- paths
 ROOT_DIR: Final = Path(__file__).parent.absolute()
 CACHE_DIR: Final = ROOT_DIR / ".cache"
@@ -31,6 +39,7 @@ DIST_DIR: Final = ROOT_DIR / "dist"
 # endregion -------------------------------------------------------------------- paths
 # region ----------------------------------------------------------------------- config
 EXE_NAME: Final = "buf"
+_ASSET_FILTER: Final = re.compile(rf"{EXE_NAME}-[^.]+(?:\.exe)?")
 EXE_TEST_ARGS: Final = ("--version",)
 
 PRJ_NAME: Final = f"{EXE_NAME}-exe"
@@ -74,12 +83,19 @@ WHL_METADATA: Final = {
     "Root-Is-Purelib": "false",
 }
 
+DOWNLOAD_CONCURRENCY: Final = 8
+
 EXE_CACHE_DIR: Final = CACHE_DIR / EXE_NAME
-EXE_BUILD_DIR: Final = BUILD_DIR / EXE_NAME
+GH_CACHE_DIR: Final = CACHE_DIR / "gh"
+VERIFY_CACHE_FILE: Final = CACHE_DIR / "verify.json"
 # endregion -------------------------------------------------------------------- config
 # region ----------------------------------------------------------------------- utils
 CI: Final = "CI" in os.environ
 GHA: Final = "GITHUB_ACTIONS" in os.environ
+_SYSTEM_MAP: Final = {"Darwin": "macos", "Linux": "linux", "Windows": "win"}
+SYSTEM: Final = _SYSTEM_MAP[platform.system()]
+WINDOWS: Final = SYSTEM == "win"
+MACHINE: Final = platform.machine().lower()
 CONSOLE: Final = Console(stderr=True)
 VERBOSE = False
 
@@ -141,49 +157,83 @@ def fpath(it: Path) -> str:
 
 
 # noinspection SpellCheckingInspection
+_PLATFORM_MAP: Final[dict[str, str]] = {
+    "Linux-aarch64": "manylinux_2_17_aarch64.manylinux2014_aarch64",
+    "Linux-x86_64": "manylinux_2_5_x86_64.manylinux1_x86_64",
+    "Darwin-arm64": "macosx_11_0_arm64",
+    "Darwin-x86_64": "macosx_10_4_x86_64",
+    "Windows-arm64": "win_arm64",
+    "Windows-x86_64": "win_amd64",
+}
+
+
+@cache
 def map_platform(s: str) -> str | None:
-    return {
-        "Linux-aarch64": "manylinux_2_17_aarch64.manylinux2014_aarch64",
-        "Linux-x86_64": "manylinux_2_5_x86_64.manylinux1_x86_64",
-        "Darwin-arm64": "macosx_11_0_arm64",
-        "Darwin-x86_64": "macosx_10_4_x86_64",
-        "Windows-arm64": "win_arm64",
-        "Windows-x86_64": "win_amd64",
-    }.get(s.removeprefix(f"{EXE_NAME}-").removesuffix(".exe"))
+    return _PLATFORM_MAP.get(s.removeprefix(f"{EXE_NAME}-").removesuffix(".exe"))
+
+
+@cache
+def normalize_version(s: str) -> str:
+    return str(Version(s))
 
 
 def run(cmd: str, *args: str, stderr: int | None = None) -> str:
-    return check_output(
-        (cmd, *args),
-        encoding="utf8",
-        stderr=stderr,
-        universal_newlines=True,
-    ).rstrip()
+    return check_output((cmd, *args), encoding="utf8", stderr=stderr).rstrip()
 
 
 def has_uncommitted_changes() -> bool:
-    return run("git", "status", "--porcelain=v1", stderr=DEVNULL) != ""
+    return spawn(("git", "diff", "--quiet", "HEAD"), stdout=DEVNULL, stderr=DEVNULL, check=False).returncode != 0
+
+
+# Regular file mode bits in the high word of the ZIP external attributes, as written on Unix.
+_PERM_ATTR: Final = {p: (p + 0o100000) << 16 for p in (0o644, 0o755)}
 
 
 @final
 class ReproducibleWheelFile(WheelFile):
-    def writestr(self, zi: ZipInfo, *args, **kwargs) -> None:
+    def writestr(self, zi: ZipInfo, *args, compress_level: int | None = None, **kwargs) -> None:
         zi.create_system = 3
         zi.date_time = (1980, 1, 1, 0, 0, 0)
+        if compress_level is not None:
+            # WheelFile.writestr does not forward a level, Python 3.13 keeps this as an alias of compress_level.
+            zi._compresslevel = compress_level  # noqa: SLF001 # pyright: ignore[reportAttributeAccessIssue]
         super().writestr(zi, *args, **kwargs)
 
 
-def emsg(headers: dict[str, Any], payload: str | None = None) -> bytes:
-    em = EmailMessage()
+def emsg(headers: dict[str, Any], payload: bytes | None = None) -> bytes:
+    """Serialize the headers and payload in the email format used by core metadata files."""
+    lines = []
     for hk, hv in headers.items():
         if isinstance(hv, list):
-            for e in hv:
-                em[hk] = e
+            lines.extend(f"{hk}: {e}\n" for e in hv)
         else:
-            em[hk] = hv
+            lines.append(f"{hk}: {hv}\n")
+    lines.append("\n")
+    it = "".join(lines).encode()
     if payload:
-        em.set_payload(payload)
-    return bytes(em)
+        return it + payload
+    return it
+
+
+def load_json(path: Path) -> Any:
+    """Load a JSON cache file, treating a missing or corrupt one as a miss."""
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def dump_json(path: Path, data: Any) -> None:
+    """Write a JSON cache file atomically, so that readers never see a partial one."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fp:
+            json.dump(data, fp)
+        Path(tmp).replace(path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
 
 
 def maybe_clean(clean: bool, directory: Path) -> None:  # noqa: FBT001
@@ -222,80 +272,88 @@ def redist(*, verbose: bool) -> None:
 def download(tag: str, *, clean: bool) -> None:
     maybe_clean(clean, EXE_CACHE_DIR)
 
-    with CONSOLE.status(f"Fetching {UPSTREAM} [bold]{tag}[/bold]...") as status, Session() as session:
-        session.headers["Accept"] = "application/vnd.github+json"
-        session.headers["Authorization"] = f"Bearer {gh_token()}"
-        session.headers["X-GitHub-Api-Version"] = "2022-11-28"
+    client = _client()
+    with CONSOLE.status(f"Fetching {UPSTREAM} [bold]{tag}[/bold]...") as status:
 
-        def download_file(dst: Path, url: str) -> None:
+        def download_file(dst: Path, url: str, size: int | None = None) -> None:
             if dst.exists():
-                debug(f"Skipping download as it is already cached: {fpath(dst)}")
-                return
-
-            status.update(f"Downloading {fpath(dst)}")
-            r = session.get(url, stream=True)
-            r.raise_for_status()
-            with dst.open("wb") as fp:
-                for chunk in r.iter_content(chunk_size=8192):
-                    fp.write(chunk)
+                if size is None or dst.stat().st_size == size:
+                    debug(f"Skipping download as it is already cached: {fpath(dst)}")
+                    return
+                warning(f"Downloading again as the cached file size does not match {size} bytes: {fpath(dst)}")
+
+            with client.stream("GET", url) as r:
+                r.raise_for_status()
+                with dst.open("wb") as fp:
+                    for chunk in r.iter_bytes(chunk_size=1024 * 1024):
+                        fp.write(chunk)
             info(f"Downloaded {fpath(dst)}")
 
         if tag != "latest":
             tag = f"tags/{tag}"
-        response = session.get(f"https://api.github.com/repos/{UPSTREAM}/releases/{tag}")
-        response.raise_for_status()
-        release = response.json()
+        release, _ = gh_get(f"https://api.github.com/repos/{UPSTREAM}/releases/{tag}")
         if tag == "latest":
             tag = release["tag_name"]
             status.update(f"Fetching {UPSTREAM} [bold]{tag}[/bold]...")
         exe_dir = EXE_CACHE_DIR / tag
         exe_dir.mkdir(parents=True, exist_ok=True)
 
-        download_file(exe_dir / "LICENSE", f"https://raw.githubusercontent.com/{UPSTREAM}/{tag}/LICENSE")
+        tasks: list[tuple[Path, str, int | None]] = [
+            (exe_dir / "LICENSE", f"https://raw.githubusercontent.com/{UPSTREAM}/{tag}/LICENSE", None),
+        ]
 
-        asset_filter = re.compile(r"\Abuf-[^.]+(?:\.exe)?\Z")
         for asset in release["assets"]:
             exe_name = asset["name"]
-            if asset_filter.match(exe_name):
-                download_file(exe_dir / exe_name, asset["browser_download_url"])
+            if _ASSET_FILTER.fullmatch(exe_name):
+                tasks.append((exe_dir / exe_name, asset["browser_download_url"], asset["size"]))
             else:
                 debug(
-                    f"Ignoring asset {exe_name!r} because it does not match the asset filter /{asset_filter.pattern}/"
+                    f"Ignoring asset {exe_name!r} because it does not match the asset filter /{_ASSET_FILTER.pattern}/"
                 )
 
+        status.update(f"Downloading {UPSTREAM} [bold]{tag}[/bold]...")
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY) as pool:
+            list(pool.map(lambda it: download_file(*it), tasks))
 
-@redist.command()
-@click.option("-c", "--clean", is_flag=True)
-@click.option("-t", "--tag", "tag_glob", default="*", metavar="GLOB")
-def build(*, clean: bool, tag_glob: str) -> None:
-    maybe_clean(clean, EXE_BUILD_DIR)
-
-    for src in EXE_CACHE_DIR.glob(tag_glob):
-        if not src.is_dir():
-            debug(f"Ignoring non-directory: {fpath(src)}")
-            continue
-
-        dst = EXE_BUILD_DIR / src.name
-        try:
-            dst.mkdir(parents=True)
-        except FileExistsError:
-            debug(f"ignoring existing: {fpath(dst)}")
-            continue
-
-        shutil.copyfile(src / "LICENSE", dst / "LICENSE")
-        for exe_src in src.glob(f"{EXE_NAME}*"):
-            if not exe_src.is_file():
-                debug(f"Ignoring non-file: {fpath(exe_src)}")
-                continue
 
-            exe_platform = map_platform(exe_src.name)
-            if exe_platform is None:
-                warning(f"Unknown platform [bold]{markup.escape(exe_src.name)}[/bold]")
-                continue
-            exe_platform = f"py2.py3-none-{exe_platform}"
-            exe_dst = dst / exe_platform
-            shutil.copyfile(exe_src, exe_dst)
-            info(f"Built {fpath(exe_dst)}")
+@final
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TagPayload:
+    whl_name: str
+    license_: bytes
+    metadata: bytes
+
+
+# Part of every wheel digest, bump it whenever assemble_wheel changes how the entries are written.
+WHL_LAYOUT_VERSION: Final = 1
+
+
+def assemble_wheel(*, whl_file: Path, exe_file: Path, exe_name: str, payload: TagPayload, wheel: bytes) -> None:
+    dist_info = f"{payload.whl_name}.dist-info"
+    digest_file = whl_file.with_suffix(".whl.sha256")
+    with exe_file.open("rb") as fp, mmap(fp.fileno(), 0, access=ACCESS_READ) as exe:
+        h = sha256(f"{WHL_LAYOUT_VERSION}\0{exe_name}".encode())
+        for v in (exe, payload.license_, payload.metadata, wheel):
+            h.update(sha256(v).digest())
+        digest = h.hexdigest()
+        if whl_file.exists() and digest_file.exists() and digest_file.read_text() == digest:
+            debug(f"skipping unchanged wheel: {whl_file.relative_to(ROOT_DIR)}")
+            return
+
+        with ReproducibleWheelFile(whl_file, "w") as it:
+            for _k, v, p, lvl in (
+                (f"{payload.whl_name}.data/scripts/{exe_name}", exe, 0o755, 1),
+                (f"{dist_info}/LICENSE", payload.license_, 0o644, None),
+                (f"{dist_info}/METADATA", payload.metadata, 0o644, None),
+                (f"{dist_info}/WHEEL", wheel, 0o644, None),
+            ):
+                k = ZipInfo(_k)
+                k.compress_type = ZIP_DEFLATED
+                k.external_attr = _PERM_ATTR[p]
+                k.file_size = len(v)
+                it.writestr(k, v, compress_level=lvl)
+    digest_file.write_text(digest)
+    info(f"Assembled [magenta bold]{whl_file.relative_to(ROOT_DIR)}")
 
 
 @redist.command()
@@ -311,50 +369,61 @@ def assemble(*, clean: bool, dev: bool, tag: str) -> None:
     else:
         version_suffix = ""
 
-    description = PRJ_DESC_PATH.read_text()
+    description = PRJ_DESC_PATH.read_bytes()
     pypi_metadata = deepcopy(PYPI_METADATA)
     whl_metadata = deepcopy(WHL_METADATA)
 
-    for tag_dir in EXE_BUILD_DIR.glob(tag):
-        if not tag_dir.is_dir():
-            debug(f"ignoring non-dir: {tag_dir.relative_to(ROOT_DIR)}")
-            continue
-
-        tag = tag_dir.name
-        version = str(Version(f"{tag.removeprefix('v')}{version_suffix}"))
-        whl_dir = DIST_DIR / version
-        whl_dir.mkdir(parents=True, exist_ok=True)
-        whl_name = f"{WHL_NAME}-{version}"
-        pypi_metadata["Version"] = version
-        pypi_metadata["Download-URL"] = f"{UPSTREAM_URL}/releases/tag/{tag}"
-        license_ = (tag_dir / "LICENSE").read_bytes()
-        for exe_file in tag_dir.glob("py2.py3-none-*"):
-            if not exe_file.is_file():
-                debug(f"ignoring non-file: {exe_file.relative_to(ROOT_DIR)}")
-                continue
-
-            pypi_platform = exe_file.name
-            whl_file = whl_dir / f"{whl_name}-{pypi_platform}.whl"
-            if whl_file.exists():
-                debug(f"skipping existing wheel: {whl_file.relative_to(ROOT_DIR)}")
+    # zlib and hashlib release the GIL while working on large buffers, threads are therefore enough to keep all cores
+    # busy.
+    futures: list[Future[None]] = []
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for tag_dir in EXE_CACHE_DIR.glob(tag):
+            if not tag_dir.is_dir():
+                debug(f"ignoring non-dir: {tag_dir.relative_to(ROOT_DIR)}")
                 continue
 
-            whl_metadata["Tag"] = pypi_platform
-            exe_name = f"{EXE_NAME}.exe" if pypi_platform.startswith("py2.py3-none-win") else EXE_NAME
-            dist_info = f"{whl_name}.dist-info"
-            with ReproducibleWheelFile(whl_file, "w") as it:
-                for _k, v, p in (
-                    (f"{whl_name}.data/scripts/{exe_name}", exe_file.read_bytes(), 0o755),
-                    (f"{dist_info}/LICENSE", license_, 0o644),
-                    (f"{dist_info}/METADATA", emsg(pypi_metadata, description), 0o644),
-                    (f"{dist_info}/WHEEL", emsg(whl_metadata), 0o644),
-                ):
-                    k = ZipInfo(_k)
-                    k.compress_type = ZIP_DEFLATED
-                    k.external_attr = (p + 0o100000) << 16
-                    k.file_size = len(v)
-                    it.writestr(k, v)
-            info(f"Assembled [magenta bold]{whl_file.relative_to(ROOT_DIR)}")
+            tag = tag_dir.name
+            version = normalize_version(f"{tag.removeprefix('v')}{version_suffix}")
+            whl_dir = DIST_DIR / version
+            whl_dir.mkdir(parents=True, exist_ok=True)
+            whl_name = f"{WHL_NAME}-{version}"
+            pypi_metadata["Version"] = version
+            pypi_metadata["Download-URL"] = f"{UPSTREAM_URL}/releases/tag/{tag}"
+            payload = TagPayload(
+                whl_name=whl_name,
+                license_=(tag_dir / "LICENSE").read_bytes(),
+                metadata=emsg(pypi_metadata, description),
+            )
+            for exe_file in tag_dir.glob(f"{EXE_NAME}*"):
+                if not exe_file.is_file():
+                    debug(f"ignoring non-file: {exe_file.relative_to(ROOT_DIR)}")
+                    continue
+
+                exe_platform = map_platform(exe_file.name)
+                if exe_platform is None:
+                    warning(f"Unknown platform [bold]{markup.escape(exe_file.name)}[/bold]")
+                    continue
+
+                if exe_file.stat().st_size == 0:
+                    warning(f"Ignoring empty executable: {fpath(exe_file)}")
+                    continue
+
+                pypi_platform = f"py2.py3-none-{exe_platform}"
+                whl_file = whl_dir / f"{whl_name}-{pypi_platform}.whl"
+                whl_metadata["Tag"] = pypi_platform
+                exe_name = f"{EXE_NAME}.exe" if pypi_platform.startswith("py2.py3-none-win") else EXE_NAME
+                futures.append(
+                    pool.submit(
+                        assemble_wheel,
+                        whl_file=whl_file,
+                        exe_file=exe_file,
+                        exe_name=exe_name,
+                        payload=payload,
+                        wheel=emsg(whl_metadata),
+                    ),
+                )
+    for it in futures:
+        it.result()
 
 
 @redist.command()
@@ -362,15 +431,31 @@ def assemble(*, clean: bool, dev: bool, tag: str) -> None:
 def verify(*, version_glob: str) -> None:
     from twine.commands.check import check
 
+    # Only wheels that passed are cached, keyed by their path and invalidated by any change of their mtime or size.
+    verified: dict[str, list[int]] = load_json(VERIFY_CACHE_FILE) or {}
     errors = False
     for version_dir in DIST_DIR.glob(version_glob):
         debug(fpath(version_dir))
         if version_dir.is_dir():
             os.chdir(version_dir)
-            dists = [str(it.relative_to(version_dir)) for it in version_dir.glob("*.whl") if it.is_file()]
-            errors |= check(dists, strict=True)
+            for whl_file in version_dir.glob("*.whl"):
+                if not whl_file.is_file():
+                    continue
+
+                stat = whl_file.stat()
+                key, fingerprint = str(whl_file), [stat.st_mtime_ns, stat.st_size]
+                if verified.get(key) == fingerprint:
+                    debug(f"Skipping already verified wheel: {fpath(whl_file)}")
+                    continue
+
+                if check([str(whl_file.relative_to(version_dir))], strict=True):
+                    errors = True
+                    verified.pop(key, None)
+                else:
+                    verified[key] = fingerprint
         else:
             debug(f"Ignoring non-directory: {fpath(version_dir)}")
+    dump_json(VERIFY_CACHE_FILE, verified)
     raise SystemExit(int(errors))
 
 
@@ -381,11 +466,8 @@ def test(args: tuple[str, ...], *, version: str) -> None:
     if len(args) == 0:
         args = EXE_TEST_ARGS
 
-    system = {"Darwin": "macos", "Linux": "linux", "Windows": "win"}[platform.system()]
-    windows = system == "win"
-    machine = platform.machine()
-    machine = f"_{machine.lower()}" if windows else f"*{machine}"
-    glob = f"{WHL_NAME}-{version}-*-{system}{machine}.whl"
+    machine = f"_{MACHINE}" if WINDOWS else f"*{MACHINE}"
+    glob = f"{version}/{WHL_NAME}-{version}-*{SYSTEM}{machine}.whl"
     wheel = next(map(str, DIST_DIR.glob(glob)), None)
     if wheel is None:
         fail(f"Could not find any wheel matching [bold]{glob!r}[/bold] in {DIST_DIR.relative_to(ROOT_DIR)}")
@@ -393,20 +475,21 @@ def test(args: tuple[str, ...], *, version: str) -> None:
     tmp = None
     pip = ["pip", "--disable-pip-version-check", "--no-input"]
     if not CI:
+        BUILD_DIR.mkdir(parents=True, exist_ok=True)
         tmp = mkdtemp(dir=BUILD_DIR)
         os.chdir(tmp)
         pip.append("--require-virtualenv")
     try:
-        check_call([*pip, "install", "--force-reinstall", wheel])
+        check_call([*pip, "install", "--force-reinstall", "--no-deps", wheel])
 
         results = (
-            run("where" if windows else "which", EXE_NAME, stderr=STDOUT),
+            run("where" if WINDOWS else "which", EXE_NAME, stderr=STDOUT),
             run(EXE_NAME, *args, stderr=STDOUT),
         )
         notice("\n".join(results))
 
         if not CI:
-            check_call([*pip, "uninstall", "--yes", wheel])
+            check_call([*pip, "uninstall", "--yes", PRJ_NAME])
     finally:
         if tmp is not None:
             shutil.rmtree(tmp, ignore_errors=True)
@@ -468,39 +551,77 @@ def file(s: Any) -> str:
     return f"[magenta]{s}[/magenta]"
 
 
-SESSION: Final = Session()
-SESSION.headers["Accept"] = "application/vnd.github+json"
-SESSION.headers["Authorization"] = f"Bearer {gh_token()}"
-SESSION.headers["X-GitHub-Api-Version"] = "2022-11-28"
-
-STATUS: Final = CONSOLE.status("")
+@cache
+def _client() -> "Client":
+    from httpx import Client, Limits
+
+    return Client(
+        http2=True,
+        follow_redirects=True,
+        limits=Limits(max_connections=DOWNLOAD_CONCURRENCY, max_keepalive_connections=DOWNLOAD_CONCURRENCY),
+        timeout=30.0,
+        headers={
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {gh_token()}",
+            "X-GitHub-Api-Version": "2022-11-28",
+        },
+    )
+
+
+@cache
+def _status() -> "Status":
+    return CONSOLE.status("")
+
+
+def gh_get(url: str) -> tuple[Any, str | None]:
+    """Get the JSON payload of a GitHub API URL, revalidated by ETag, and the URL of its next page, if any."""
+    cache_file = GH_CACHE_DIR / f"{sha256(url.encode()).hexdigest()}.json"
+    cached = load_json(cache_file)
+    headers = {} if cached is None else {"If-None-Match": cached["etag"]}
+    response = _client().get(url, headers=headers)
+    if cached is not None and response.status_code == NOT_MODIFIED:
+        debug(f"Using cached response for {href(url)}")
+        return cached["body"], cached["next"]
+    if response.status_code != OK:
+        fail(f"Request failed {href(url)}")
+
+    body = response.json()
+    next_url = response.links.get("next", {}).get("url")
+    etag = response.headers.get("ETag")
+    if etag is not None:
+        dump_json(cache_file, {"etag": etag, "next": next_url, "body": body})
+    return body, next_url
 
 
 def fetch_releases(repo: str) -> Iterable[Release]:
     page = 1
     url = f"https://api.github.com/repos/{repo}/releases?per_page=100"
     while True:
-        STATUS.update(f"Fetching {href(f'{url}&page={page}')}")
-        response = SESSION.get(url)
-        if response.status_code != OK:
-            fail(f"Request failed {href(url)}")
-        for it in Release.schema().load(response.json(), many=True, unknown="exclude"):  # type: Release
+        _status().update(f"Fetching {href(f'{url}&page={page}')}")
+        releases, next_url = gh_get(url)
+        for it in Release.schema().load(releases, many=True, unknown="exclude"):  # type: Release
             if not it.draft and not it.prerelease:
                 yield it
-        if "next" not in response.links:
+        if next_url is None:
             break
         page += 1
-        url = response.links["next"]["url"]
+        url = next_url
 
 
 @redist.command()
 def sync() -> None:
-    origin_releases = frozenset(fetch_releases(ORIGIN))
-    for it in origin_releases:
-        print(it)
-    upstream_releases = frozenset(fetch_releases(UPSTREAM))
+    # functools.cache does not serialize concurrent misses, create the shared client and status before the threads.
+    _client()
+    _status()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        origin_f = pool.submit(lambda: frozenset(it.tag_name for it in fetch_releases(ORIGIN)))
+        upstream_f = pool.submit(lambda: frozenset(fetch_releases(UPSTREAM)))
+    origin_tags = origin_f.result()
+    upstream_releases = upstream_f.result()
+    # Releases are compared by tag because their ids differ between the two repositories.
     for it in upstream_releases:
-        print(it)
+        if it.tag_name not in origin_tags:
+            print(it)
 
 
 # endregion -------------------------------------------------------------------- cli